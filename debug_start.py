@@ -0,0 +1,72 @@
+"""起動前チェック付きのランチャー
+
+ファイルがそろっているか確認してから本体を起動する。
+"""
+
+import os
+import sys
+from pathlib import Path
+
+# 起動中に何度も Path を組み立てないよう、ここで一度だけ解決する
+SCRIPT_DIR = Path(__file__).resolve().parent
+LIB_PATH = SCRIPT_DIR / "lib"
+
+
+def check_files():
+    """lib 配下に必要なファイルがそろっているか確認する"""
+    print("VRChat Log Viewer 起動チェック")
+    print("ファイル確認中...")
+
+    required_files = [
+        "constants.py",
+        "utils.py",
+        "async_loader.py",
+        "plugin_manager.py",
+        "progress_dialog.py",
+        "theme_manager.py",
+        "theme_editor.py",
+        "ui_builder.py",
+        "virtual_tree.py",
+        "main_window.py",
+    ]
+
+    # ファイルごとに stat せず、ディレクトリを1回読んで照合する
+    if not LIB_PATH.is_dir():
+        print("lib フォルダが見つかりません")
+        sys.exit(1)
+    present = {entry.name for entry in os.scandir(LIB_PATH)}
+
+    missing = []
+    for filename in required_files:
+        if filename in present:
+            print(f"  ✓ {filename}")
+        else:
+            print(f"  ✗ {filename}")
+            missing.append(filename)
+
+    if missing:
+        print(f"必要なファイルが見つかりません: {', '.join(missing)}")
+        sys.exit(1)
+
+    print("tkinter 確認中...")
+    try:
+        import tkinter  # noqa: F401
+    except ImportError:
+        print("tkinter が利用できません")
+        sys.exit(1)
+    print("確認完了")
+
+
+def main():
+    # 通常起動ではチェックを全部飛ばして即 Tk を立ち上げる。
+    # 問題の切り分け時だけ --check を付けて走らせる
+    if "--check" in sys.argv:
+        check_files()
+
+    sys.path.insert(0, str(LIB_PATH))
+    from main_window import main as run_app
+    run_app()
+
+
+if __name__ == "__main__":
+    main()
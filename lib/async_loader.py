@@ -0,0 +1,249 @@
+"""ログファイルの非同期読み込み"""
+
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from typing import Callable, List, Optional
+
+from constants import (
+    BATCH_SIZE,
+    LARGE_FILE_THRESHOLD_MB,
+    MAX_NOTIFICATIONS,
+    NOTIFICATION_RE,
+    REGEX_MAX_LINE_LENGTH,
+    STATUS_MESSAGES,
+)
+from utils import FileUtils, NotificationData, NotificationParser
+
+
+def _parse_file_worker(file_path: Path) -> List[NotificationData]:
+    """子プロセス側で1ファイルぶんの通知を抽出する
+
+    ProcessPoolExecutor から pickle 経由で呼ばれるため
+    モジュールレベルの関数にしてある。
+    """
+    content = FileUtils.read_file_with_encoding(file_path)
+    return NotificationParser.parse_notifications(content)
+
+
+class ParallelLogLoader:
+    """複数ファイルの通知抽出をプロセス並列で行う
+
+    正規表現とデコードは CPU バウンドなので、ファイル単位で
+    子プロセスに分ければコア数に近い倍率で速くなる。
+    """
+
+    # これ未満ならプロセス起動コストのほうが高くつくので直列で処理する
+    PARALLEL_MIN_FILES = 2
+    PARALLEL_MIN_TOTAL_MB = 10
+
+    @classmethod
+    def load_notifications(
+            cls, files: List[Path]) -> List[NotificationData]:
+        """ファイル群から通知を抽出し、ファイル順に連結して返す"""
+        try:
+            total_mb = sum(
+                os.path.getsize(p) for p in files) / (1024 * 1024)
+        except OSError:
+            total_mb = 0.0
+        if len(files) < cls.PARALLEL_MIN_FILES \
+                or total_mb < cls.PARALLEL_MIN_TOTAL_MB:
+            notifications: List[NotificationData] = []
+            for path in files:
+                notifications.extend(_parse_file_worker(path))
+            del notifications[MAX_NOTIFICATIONS:]
+            return notifications
+        workers = min(os.cpu_count() or 1, len(files))
+        results: dict = {}
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = {executor.submit(_parse_file_worker, path): i
+                       for i, path in enumerate(files)}
+            for future in as_completed(futures):
+                results[futures[future]] = future.result()
+        notifications = []
+        for i in range(len(files)):
+            notifications.extend(results[i])
+        del notifications[MAX_NOTIFICATIONS:]
+        return notifications
+
+
+class AsyncLogLoader:
+    """ワーカースレッドでログを読み込み、進捗をUIに渡す"""
+
+    def __init__(self, root=None):
+        # root があれば after_idle で直接UIスレッドへ渡し、
+        # 無ければ最新の進捗スロットを poll で取り出してもらう
+        self._root = root
+        self._on_progress: Optional[Callable[[str, int], None]] = None
+        self._on_complete: Optional[Callable] = None
+        self._on_error: Optional[Callable] = None
+        self._progress_lock = threading.Lock()
+        self._latest_progress: Optional[tuple] = None
+        self._result: Optional[tuple] = None
+        self.cancel_flag = threading.Event()
+        self.worker: Optional[threading.Thread] = None
+        self._last_progress_ts = 0.0
+
+    def _emit(self, message: str, percentage: int) -> None:
+        """進捗をUIへ渡す。50msに1回へ間引く"""
+        now = time.monotonic()
+        if percentage < 100 and now - self._last_progress_ts <= 0.05:
+            return
+        self._last_progress_ts = now
+        if self._root is not None and self._on_progress is not None:
+            # Tk がアイドルになったタイミングでまとめて処理される
+            callback = self._on_progress
+            self._root.after_idle(
+                lambda: callback(message, percentage))
+            return
+        with self._progress_lock:
+            self._latest_progress = (message, percentage)
+
+    def _finish(self, result: tuple) -> None:
+        if self._root is not None:
+            if result[0] == 'complete' and self._on_complete is not None:
+                callback = self._on_complete
+                self._root.after_idle(
+                    lambda: callback(result[1], result[2]))
+                return
+            if result[0] == 'error' and self._on_error is not None:
+                callback = self._on_error
+                self._root.after_idle(lambda: callback(result[1]))
+                return
+        with self._progress_lock:
+            self._result = result
+
+    def load_async(self, file_path: Path,
+                   on_progress: Optional[Callable] = None,
+                   on_complete: Optional[Callable] = None,
+                   on_error: Optional[Callable] = None) -> None:
+        """読み込みを開始する
+
+        root 付きで構築されていればコールバックが after_idle 経由で
+        UIスレッドに届く。そうでなければ poll で取り出す。
+        """
+        self._on_progress = on_progress
+        self._on_complete = on_complete
+        self._on_error = on_error
+        self.cancel_flag.clear()
+        with self._progress_lock:
+            self._latest_progress = None
+            self._result = None
+        self.worker = threading.Thread(
+            target=self._load_worker, args=(file_path,), daemon=True)
+        self.worker.start()
+
+    def cancel(self) -> None:
+        self.cancel_flag.set()
+
+    def poll(self) -> Optional[tuple]:
+        """UIスレッドから呼び、最新の進捗または結果を取り出す"""
+        with self._progress_lock:
+            if self._latest_progress is not None:
+                message, percentage = self._latest_progress
+                self._latest_progress = None
+                return ('progress', message, percentage)
+            if self._result is not None:
+                result = self._result
+                self._result = None
+                return result
+        return None
+
+    @staticmethod
+    def _done_message(notifications) -> str:
+        """完了メッセージ。上限で打ち切った場合はその旨を返す"""
+        if len(notifications) >= MAX_NOTIFICATIONS:
+            return STATUS_MESSAGES['truncated']
+        return STATUS_MESSAGES['done']
+
+    def _load_worker(self, file_path: Path) -> None:
+        try:
+            file_size = os.path.getsize(file_path)
+            file_size_mb = file_size / (1024 * 1024)
+            loading_msg = f"読み込み中... ({file_size_mb:.1f}MB)"
+
+            self._emit(loading_msg, 10)
+            if self.cancel_flag.is_set():
+                return
+
+            def on_chunk_read(bytes_read, total):
+                if total > 0:
+                    pct = 10 + int(bytes_read / total * 40)
+                    self._emit(loading_msg, pct)
+
+            # 全文 str を経由せず、行のリストを直接作る
+            lines = list(FileUtils.iter_lines_with_encoding(
+                file_path, on_chunk_read, self.cancel_flag))
+            if self.cancel_flag.is_set():
+                return
+
+            self._emit(STATUS_MESSAGES['parsing'], 70)
+            encoding = FileUtils.detect_encoding(file_path)
+            if file_size_mb > LARGE_FILE_THRESHOLD_MB \
+                    and not encoding.startswith('utf-16'):
+                # 巨大ファイルは mmap 上のバイト列を直接走査し、
+                # マッチしたグループだけデコードする。UTF-16 は
+                # ASCII 互換でなくバイト列パターンが効かないので
+                # 行単位の走査へフォールバックする
+                fd, mm = FileUtils.open_mmap(file_path)
+                try:
+                    notifications = \
+                        NotificationParser.parse_notifications_bytes(
+                            mm, encoding=encoding,
+                            cancel_flag=self.cancel_flag)
+                finally:
+                    mm.close()
+                    os.close(fd)
+                if self.cancel_flag.is_set():
+                    return
+                self._emit(self._done_message(notifications), 100)
+                self._finish(('complete', lines, notifications))
+                return
+            # 全文を一括で正規表現にかけず、通知リテラルを含む行だけ
+            # 行単位で走査する。BATCH_SIZE ごとにキャンセルも確認する
+            total_lines = len(lines)
+            if total_lines >= NotificationParser.PARALLEL_MIN_LINES:
+                # 行数が多いときはコア数分のスラブに割って並列走査
+                notifications = NotificationParser.parse_lines_parallel(
+                    lines, self.cancel_flag)
+                if self.cancel_flag.is_set():
+                    return
+                self._emit(self._done_message(notifications), 100)
+                self._finish(('complete', lines, notifications))
+                return
+            notifications = []
+            skipped_long = 0
+            search = NOTIFICATION_RE.search
+            for i, line in enumerate(lines):
+                if i % BATCH_SIZE == 0:
+                    if self.cancel_flag.is_set():
+                        return
+                    if total_lines > 0 and i % (BATCH_SIZE * 100) == 0:
+                        pct = 70 + int(i / total_lines * 20)
+                        self._emit(STATUS_MESSAGES['parsing'], pct)
+                # 巨大な行は正規表現の最悪ケースを踏みやすいので飛ばす
+                if len(line) > REGEX_MAX_LINE_LENGTH:
+                    skipped_long += 1
+                    continue
+                if "Received Notification:" not in line:
+                    continue
+                m = search(line)
+                if m is None:
+                    continue
+                notif = NotificationParser.parse_match(m)
+                if notif is not None:
+                    notifications.append(notif)
+                    if len(notifications) >= MAX_NOTIFICATIONS:
+                        break
+            if self.cancel_flag.is_set():
+                return
+            if skipped_long:
+                print(f"通知解析: {REGEX_MAX_LINE_LENGTH}文字超の行を"
+                      f"{skipped_long}行スキップしました")
+
+            self._emit(self._done_message(notifications), 100)
+            self._finish(('complete', lines, notifications))
+        except Exception as e:
+            self._finish(('error', e))
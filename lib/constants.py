@@ -0,0 +1,113 @@
+"""VRChat Log Viewer の定数定義"""
+
+import os
+import re
+from types import MappingProxyType
+
+# VRChat のログ出力先(Windows)
+VRCHAT_LOG_DIR = os.path.join(
+    os.path.expanduser("~"), "AppData", "LocalLow", "VRChat", "VRChat"
+)
+
+# ログファイル名のパターン
+LOG_FILE_PREFIX = "output_log_"
+LOG_FILE_SUFFIX = ".txt"
+
+# 行頭のタイムスタンプ (例: 2024.01.23 12:34:56)
+LOG_TIMESTAMP_PATTERN = r'^(\d{4}\.\d{2}\.\d{2} \d{2}:\d{2}:\d{2})'
+
+# [Behaviour] などのタグ
+TAG_PATTERN = r'\[([^\]]+)\]'
+
+# グループインバイト等の通知行。
+# `.*?` の連鎖はマッチしない行でバックトラックが爆発するので、
+# 否定文字クラスでフィールド間を区切り、リテラルで早期に失敗させる
+NOTIFICATION_PATTERN = (
+    r'(\d{4}\.\d{2}\.\d{2} \d{2}:\d{2}:\d{2})[^\n]*?'
+    r'Received Notification: <Notification[^>]*?'
+    r'id:\s(not_[\w-]+)[^>]*?'
+    r'created at:\s([\d/]+ [\d:]+ \w+)[^>]*?'
+    r'message:\s"([^"]+)">'
+)
+
+# ログレベル判定。グループ番号 (m.lastindex) がそのまま
+# エラー=1 / 警告=2 / 情報=3 / デバッグ=4 の分類になる
+LOG_LEVEL_PATTERN = r'(error|exception)|(warning)|(info)|(debug)'
+
+# 任意依存: google-re2 があれば通知パターンを線形時間保証の
+# DFA エンジンでコンパイルする。無ければ標準の re で動く
+try:
+    import re2 as _notification_engine
+except ImportError:
+    _notification_engine = re
+
+# コンパイル済みパターン。呼び出し側で毎回 re.compile させない
+LOG_TIMESTAMP_RE = re.compile(LOG_TIMESTAMP_PATTERN)
+TAG_RE = re.compile(TAG_PATTERN)
+NOTIFICATION_RE = _notification_engine.compile(NOTIFICATION_PATTERN)
+LOG_LEVEL_RE = re.compile(LOG_LEVEL_PATTERN, re.IGNORECASE)
+
+# ファイル読み込み関連
+LARGE_FILE_THRESHOLD_MB = 50      # これ以上は「大きいファイル」扱い
+CHUNK_READ_THRESHOLD_MB = 5       # これ以上はチャンク読み込み
+CHUNK_SIZE = 1024 * 1024          # 1MB
+BATCH_SIZE = 100                  # 進捗・キャンセル確認の粒度
+
+# UI 上で折りたたむ長さ
+LONG_LINE_THRESHOLD = 300
+
+# これより長い行は正規表現にかけない(巨大なJSONペイロード等)
+REGEX_MAX_LINE_LENGTH = 16_384
+
+# 抽出する通知の上限。UI で人が読める件数をはるかに超えたら打ち切る
+MAX_NOTIFICATIONS = 5000
+
+# ログレベルごとの表示色。
+# 書き換えを想定しないので MappingProxyType の読み取り専用ビューにし、
+# 呼び出し側に防御的コピーをさせない
+LOG_COLORS = MappingProxyType({
+    'error': '#ff6b6b',
+    'warning': '#feca57',
+    'info': '#54a0ff',
+    'debug': '#95afc0',
+    'notification': '#1dd1a1',
+})
+
+# ダークテーマの基本色
+DARK_THEME = MappingProxyType({
+    'bg': '#1e1e1e',
+    'fg': '#d4d4d4',
+    'select_bg': '#264f78',
+    'select_fg': '#ffffff',
+    'tree_bg': '#252526',
+    'tree_fg': '#cccccc',
+    'entry_bg': '#3c3c3c',
+    'entry_fg': '#d4d4d4',
+    'button_bg': '#0e639c',
+    'button_fg': '#ffffff',
+})
+
+ERROR_MESSAGES = MappingProxyType({
+    'file_not_found': "ログファイルが見つかりません",
+    'read_error': "ファイルの読み込みに失敗しました",
+    'encoding_error': "文字コードを判別できませんでした",
+    'parse_error': "ログの解析に失敗しました",
+    'export_error': "エクスポートに失敗しました",
+})
+
+STATUS_MESSAGES = MappingProxyType({
+    'ready': "準備完了",
+    'loading': "読み込み中...",
+    'parsing': "解析中...",
+    'cancelled': "キャンセルされました",
+    'done': "完了",
+    'truncated': "通知が多すぎるため先頭のみ表示しています",
+})
+
+SHORTCUTS = MappingProxyType({
+    'open': '<Control-o>',
+    'reload': '<F5>',
+    'export': '<Control-e>',
+    'quit': '<Control-q>',
+    'search': '<Control-f>',
+})
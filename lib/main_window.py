@@ -0,0 +1,292 @@
+"""メインウィンドウ"""
+
+import tkinter as tk
+from pathlib import Path
+from tkinter import filedialog, messagebox, ttk
+from typing import List, Optional
+
+from async_loader import AsyncLogLoader
+from constants import (
+    ERROR_MESSAGES,
+    SHORTCUTS,
+    STATUS_MESSAGES,
+    VRCHAT_LOG_DIR,
+)
+from plugin_manager import PluginManager, PluginManagerDialog
+from progress_dialog import ProgressDialog
+from theme_editor import ThemeEditor
+from theme_manager import ThemeManager
+from ui_builder import UIBuilder
+from utils import (
+    FileUtils,
+    GroupUtils,
+    LogParser,
+    NotificationData,
+)
+
+
+class AppContext:
+    """プラグインへ渡すアプリ情報"""
+
+    def __init__(self, root, viewer):
+        self.root = root
+        self.viewer = viewer
+
+
+class VRChatLogViewer:
+    """アプリ本体"""
+
+    def __init__(self, root):
+        self.root = root
+        self.root.title("VRChat Log Viewer")
+        self.root.geometry("1100x700")
+
+        base_dir = Path(__file__).resolve().parent
+        self.theme_manager = ThemeManager(base_dir.parent / "themes")
+        self.plugin_manager = PluginManager(
+            base_dir / "plugins", AppContext(root, self))
+        self.loader = AsyncLogLoader(root)
+
+        self.current_lines: List[str] = []
+        self.notifications: List[NotificationData] = []
+        self.groups = {}
+        self.progress_dialog: Optional[ProgressDialog] = None
+
+        self._setup_ui()
+        self._bind_shortcuts()
+        self.plugin_manager.load_all_plugins()
+        self._apply_theme()
+
+    def _setup_ui(self):
+        callbacks = {
+            'open_file': self.open_file,
+            'open_latest': self.open_latest_log,
+            'export_text': self.export_text,
+            'export_json': self.export_json,
+            'quit': self.root.quit,
+            'change_theme': self.change_theme,
+            'edit_theme': self.edit_theme,
+            'manage_plugins': self.manage_plugins,
+            'get_plugin_menu_items':
+                self.plugin_manager.get_plugin_menu_items,
+            'on_filter_changed': self.apply_filters,
+            'on_group_selected': self.on_group_selected,
+        }
+        self.menubar, self.plugin_menu = UIBuilder.setup_menubar(
+            self.root, callbacks)
+        self.filter_frame, self.filter_vars = UIBuilder.setup_filter_frame(
+            self.root, callbacks)
+
+        paned = ttk.PanedWindow(self.root, orient=tk.VERTICAL)
+        paned.pack(fill=tk.BOTH, expand=True, padx=4, pady=2)
+
+        log_frame = ttk.Frame(paned)
+        self.log_tree = UIBuilder.setup_log_tree(log_frame)
+        paned.add(log_frame, weight=3)
+
+        msg_panel, self.msg_tree, self.message_text = \
+            UIBuilder.setup_message_panel(paned, callbacks)
+        paned.add(msg_panel, weight=1)
+
+        self.status_var = tk.StringVar(value=STATUS_MESSAGES['ready'])
+        status_bar = ttk.Label(self.root, textvariable=self.status_var,
+                               relief=tk.SUNKEN, anchor=tk.W)
+        status_bar.pack(fill=tk.X, side=tk.BOTTOM)
+
+    def _bind_shortcuts(self):
+        self.root.bind(SHORTCUTS['open'], lambda e: self.open_file())
+        self.root.bind(SHORTCUTS['reload'], lambda e: self.open_latest_log())
+        self.root.bind(SHORTCUTS['export'], lambda e: self.export_text())
+        self.root.bind(SHORTCUTS['quit'], lambda e: self.root.quit())
+
+    # ---- ファイル読み込み ----
+
+    def open_file(self):
+        path = filedialog.askopenfilename(
+            initialdir=VRCHAT_LOG_DIR,
+            filetypes=[("VRChat ログ", "output_log_*.txt"),
+                       ("テキスト", "*.txt"), ("すべて", "*.*")])
+        if path:
+            self._start_load(Path(path))
+
+    def open_latest_log(self):
+        files = FileUtils.get_sorted_log_files(VRCHAT_LOG_DIR)
+        if not files:
+            messagebox.showwarning(
+                "ログが見つかりません", ERROR_MESSAGES['file_not_found'])
+            return
+        self._start_load(files[0])
+
+    def _start_load(self, file_path: Path):
+        self.status_var.set(STATUS_MESSAGES['loading'])
+        self.progress_dialog = ProgressDialog(
+            self.root, on_cancel=self.loader.cancel)
+        # ワーカーが after_idle で直接UIスレッドへ通知してくる
+        self.loader.load_async(
+            file_path,
+            on_progress=self._on_load_progress,
+            on_complete=self._on_load_complete,
+            on_error=self._on_load_error)
+
+    def _on_load_progress(self, message, percentage):
+        if self.progress_dialog:
+            self.progress_dialog.set_progress(message, percentage)
+
+    def _on_load_complete(self, lines, notifications):
+        if self.progress_dialog:
+            self.progress_dialog.close()
+            self.progress_dialog = None
+        self.current_lines = lines
+        self.notifications = notifications
+        self.apply_filters()
+        self._refresh_groups()
+        self.plugin_manager.notify_log_loaded(lines)
+        self.status_var.set(
+            f"{len(lines):,} 行 / 通知 {len(notifications):,} 件")
+
+    def _on_load_error(self, error):
+        if self.progress_dialog:
+            self.progress_dialog.close()
+            self.progress_dialog = None
+        self.status_var.set(STATUS_MESSAGES['ready'])
+        messagebox.showerror("読み込みエラー",
+                             f"{ERROR_MESSAGES['read_error']}\n{error}")
+
+    # ---- フィルタと表示 ----
+
+    def apply_filters(self):
+        filters = {level: var.get()
+                   for level, var in self.filter_vars.items()}
+        entries = []
+        quick_level = LogParser.quick_level
+        parse = LogParser.parse_log_line
+        show = LogParser.should_show_log
+        for line in self.current_lines:
+            # レベルだけ先に見て、表示しない行はフル解析しない
+            if not show(quick_level(line), filters):
+                continue
+            entry = parse(line)
+            if entry is not None:
+                entries.append(entry)
+        self.log_tree.set_logs(entries)
+        self.plugin_manager.notify_log_filtered(
+            [e.content for e in entries])
+
+    def _refresh_groups(self):
+        self.groups = GroupUtils.organize_notifications_by_group(
+            self.notifications)
+        self.msg_tree.delete(*self.msg_tree.get_children())
+        for group_id, group in sorted(
+                self.groups.items(),
+                key=lambda kv: len(kv[1]['messages']), reverse=True):
+            self.msg_tree.insert(
+                "", tk.END, iid=group_id,
+                values=(group['name'], len(group['messages'])))
+
+    def on_group_selected(self, event=None):
+        selection = self.msg_tree.selection()
+        if not selection:
+            return
+        group = self.groups.get(selection[0])
+        if group is None:
+            return
+        self.message_text.config(state=tk.NORMAL)
+        self.message_text.delete("1.0", tk.END)
+        for notif in group['messages']:
+            self.message_text.insert(
+                tk.END, f"[{notif.timestamp}]\n{notif.message}\n\n")
+        self.message_text.config(state=tk.DISABLED)
+
+    # ---- エクスポート ----
+
+    def export_text(self):
+        if not self.notifications:
+            messagebox.showinfo("エクスポート", "通知がありません")
+            return
+        path = filedialog.asksaveasfilename(
+            defaultextension=".txt",
+            filetypes=[("テキスト", "*.txt"), ("すべて", "*.*")])
+        if not path:
+            return
+        text = GroupUtils.export_to_text(self.groups, self.notifications)
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(text)
+        self.status_var.set(f"エクスポートしました: {path}")
+
+    def export_json(self):
+        if not self.notifications:
+            messagebox.showinfo("エクスポート", "通知がありません")
+            return
+        path = filedialog.asksaveasfilename(
+            defaultextension=".json",
+            filetypes=[("JSON", "*.json"), ("すべて", "*.*")])
+        if not path:
+            return
+        text = GroupUtils.export_to_json(self.groups, self.notifications)
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(text)
+        self.status_var.set(f"エクスポートしました: {path}")
+
+    # ---- テーマ・プラグイン ----
+
+    def _apply_theme(self):
+        theme = self.theme_manager.current_theme
+        if theme is None:
+            return
+        style = ttk.Style(self.root)
+        self.root.configure(bg=theme.background)
+        style.configure("Treeview", background=theme.tree_bg,
+                        foreground=theme.tree_fg,
+                        fieldbackground=theme.tree_bg)
+        style.map("Treeview",
+                  background=[('selected', theme.select_bg)],
+                  foreground=[('selected', theme.select_fg)])
+        self.message_text.configure(
+            bg=theme.text_area_bg, fg=theme.text_area_fg)
+
+    def change_theme(self):
+        names = list(self.theme_manager.available_themes.keys())
+        if not names:
+            return
+        dialog = tk.Toplevel(self.root)
+        dialog.title("テーマ切り替え")
+        dialog.transient(self.root)
+        listbox = tk.Listbox(dialog, height=len(names))
+        for name in names:
+            listbox.insert(tk.END, name)
+        listbox.pack(fill=tk.BOTH, expand=True, padx=8, pady=8)
+
+        def on_ok():
+            selection = listbox.curselection()
+            if selection:
+                self.theme_manager.set_theme(names[selection[0]])
+                self._apply_theme()
+            dialog.destroy()
+
+        ttk.Button(dialog, text="OK", command=on_ok).pack(pady=(0, 8))
+
+    def edit_theme(self):
+        theme = self.theme_manager.current_theme
+        if theme is None:
+            return
+
+        def on_save(edited):
+            self.theme_manager.available_themes[edited.name] = edited
+            self.theme_manager.save_theme(edited)
+            self.theme_manager.set_theme(edited.name)
+            self._apply_theme()
+
+        ThemeEditor(self.root, theme, on_save)
+
+    def manage_plugins(self):
+        PluginManagerDialog(self.root, self.plugin_manager)
+
+
+def main():
+    root = tk.Tk()
+    VRChatLogViewer(root)
+    root.mainloop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,368 @@
+"""プラグインの検出・読み込み・管理"""
+
+import importlib.util
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional
+
+# 任意依存: orjson があれば設定ファイルの読み書きが数倍速い
+try:
+    import orjson
+
+    def _dumps(data) -> bytes:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2)
+
+    _loads = orjson.loads
+except ImportError:
+    import json
+
+    def _dumps(data) -> bytes:
+        return json.dumps(data, ensure_ascii=False, indent=2).encode('utf-8')
+
+    _loads = json.loads
+
+
+# 初回起動時に書き出すサンプルプラグイン。
+# ソースを文字列リテラルで二重管理すると同梱版とすぐ乖離するので、
+# lib/plugins に同梱している実ファイルをそのままコピー元にする
+_BUNDLED_PLUGINS_DIR = Path(__file__).resolve().parent / "plugins"
+_SAMPLE_PLUGIN_NAMES = ("log_statistics.py", "export_extended.py")
+
+
+@dataclass(slots=True)
+class PluginInfo:
+    """プラグインのメタ情報"""
+    id: str
+    name: str
+    version: str = "1.0.0"
+    author: str = ""
+    description: str = ""
+    install_date: str = ""
+    enabled: bool = True
+    file_path: str = ""
+
+    def to_dict(self) -> dict:
+        # asdict はフィールドを deepcopy しながら再帰するので使わない
+        return {
+            'id': self.id,
+            'name': self.name,
+            'version': self.version,
+            'author': self.author,
+            'description': self.description,
+            'install_date': self.install_date,
+            'enabled': self.enabled,
+            'file_path': self.file_path,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "PluginInfo":
+        return cls(**data)
+
+
+class LoweredLogs:
+    """lower() 済みログ行の遅延ビュー
+
+    複数のプラグインがそれぞれ log.lower() し直すと同じ割り当てを
+    プラグイン数ぶん繰り返すので、最初に要求されたときに1回だけ
+    作って全員で共有する。誰も使わなければコストはゼロ。
+    """
+
+    __slots__ = ('_logs', '_lowered')
+
+    def __init__(self, logs):
+        self._logs = logs
+        self._lowered = None
+
+    def lines(self) -> List[str]:
+        if self._lowered is None:
+            self._lowered = [s.lower() for s in self._logs]
+        return self._lowered
+
+
+class Plugin:
+    """プラグインの基底クラス"""
+
+    def __init__(self, app_context=None):
+        self.app_context = app_context
+        self.info = PluginInfo(id="", name="")
+
+    def on_load(self):
+        pass
+
+    def on_unload(self):
+        pass
+
+    def on_log_loaded(self, logs, lowered: Optional[LoweredLogs] = None):
+        pass
+
+    def on_log_filtered(self, logs):
+        pass
+
+    def get_menu_items(self):
+        """(ラベル, コールバック) のリストを返す"""
+        return []
+
+
+class PluginManager:
+    """plugins ディレクトリからプラグインを検出して管理する"""
+
+    def __init__(self, plugins_dir: Path, app_context=None):
+        self.plugins_dir = Path(plugins_dir)
+        self.app_context = app_context
+        self.loaded_plugins: Dict[str, Plugin] = {}
+        self.plugin_states: Dict[str, bool] = {}
+        self.config_file = self.plugins_dir / "plugin_config.json"
+        # discover_plugins の再実行でファイルを exec し直さないための
+        # (mtime_ns, プラグイン) キャッシュ
+        self._discover_cache: Dict[Path, tuple] = {}
+        # 集約済みメニュー項目。プラグイン構成が変わるまで使い回す
+        self._menu_items_cache: Optional[List[tuple]] = None
+        self.plugins_dir.mkdir(parents=True, exist_ok=True)
+        self._create_sample_plugins()
+        self.load_config()
+
+    def _create_sample_plugins(self):
+        """サンプルプラグインが無ければ同梱版からコピーする"""
+        for name in _SAMPLE_PLUGIN_NAMES:
+            target = self.plugins_dir / name
+            source = _BUNDLED_PLUGINS_DIR / name
+            if target == source or target.exists():
+                continue
+            try:
+                target.write_bytes(source.read_bytes())
+            except OSError as e:
+                print(f"サンプルプラグインの書き出しに失敗 {name}: {e}")
+
+    def load_config(self):
+        if self.config_file.exists():
+            try:
+                data = _loads(self.config_file.read_bytes())
+                self.plugin_states = data.get('states', {})
+            except (OSError, ValueError) as e:
+                print(f"プラグイン設定の読み込みに失敗: {e}")
+                self.plugin_states = {}
+
+    def save_config(self):
+        data = {'states': self.plugin_states}
+        try:
+            self.config_file.write_bytes(_dumps(data))
+        except OSError as e:
+            print(f"プラグイン設定の保存に失敗: {e}")
+
+    def discover_plugins(self) -> List[Plugin]:
+        """plugins ディレクトリの .py を読み込んでプラグインを返す
+
+        変更されていないファイルは前回の exec 結果を再利用する。
+        """
+        files = sorted(self.plugins_dir.glob("*.py"))
+        mtimes = {f: f.stat().st_mtime_ns for f in files}
+        to_load = [
+            f for f in files
+            if self._discover_cache.get(f, (None,))[0] != mtimes[f]
+        ]
+        if to_load:
+            # ソース読み込みは IO バウンドなので並列に exec する。
+            # コンパイル部分は GIL 下でもディスク待ちとは重なる
+            workers = min(len(to_load), 4)
+            with ThreadPoolExecutor(max_workers=workers) as ex:
+                loaded = ex.map(self._load_plugin_file, to_load)
+            for plugin_file, plugin in zip(to_load, loaded):
+                self._discover_cache[plugin_file] = \
+                    (mtimes[plugin_file], plugin)
+        plugins = []
+        for plugin_file in files:
+            plugin = self._discover_cache[plugin_file][1]
+            if plugin is not None:
+                plugins.append(plugin)
+        # 削除されたファイルのキャッシュは捨てる
+        for stale in [p for p in self._discover_cache if p not in mtimes]:
+            del self._discover_cache[stale]
+        return plugins
+
+    # 並列ロード時の sys.modules 書き換えを直列化する
+    _modules_lock = threading.Lock()
+
+    def _load_plugin_file(self, plugin_file: Path) -> Optional[Plugin]:
+        module_name = f"vlv_plugin_{plugin_file.stem}"
+        try:
+            spec = importlib.util.spec_from_file_location(
+                module_name, plugin_file)
+            if spec is None or spec.loader is None:
+                return None
+            module = importlib.util.module_from_spec(spec)
+            with self._modules_lock:
+                sys.modules[module_name] = module
+            spec.loader.exec_module(module)
+            if not hasattr(module, 'create_plugin'):
+                return None
+            plugin = module.create_plugin(self.app_context)
+            plugin.info.file_path = str(plugin_file)
+            return plugin
+        except Exception as e:
+            print(f"プラグイン読み込み失敗 {plugin_file.name}: {e}")
+            return None
+
+    def load_all_plugins(self):
+        """検出したプラグインをすべてロードする"""
+        for plugin in self.discover_plugins():
+            plugin_id = plugin.info.id
+            if not self.plugin_states.get(plugin_id, True):
+                continue
+            if plugin_id in self.loaded_plugins:
+                continue
+            try:
+                plugin.on_load()
+                self.loaded_plugins[plugin_id] = plugin
+                self._menu_items_cache = None
+            except Exception as e:
+                print(f"プラグイン初期化失敗 {plugin.info.name}: {e}")
+
+    def unload_plugin(self, plugin_id: str):
+        plugin = self.loaded_plugins.pop(plugin_id, None)
+        if plugin is not None:
+            self._menu_items_cache = None
+            try:
+                plugin.on_unload()
+            except Exception as e:
+                print(f"プラグイン終了処理失敗 {plugin.info.name}: {e}")
+
+    def enable_plugin(self, plugin_id: str):
+        self.plugin_states[plugin_id] = True
+        self._menu_items_cache = None
+        self.save_config()
+        self.load_all_plugins()
+
+    def disable_plugin(self, plugin_id: str):
+        self.plugin_states[plugin_id] = False
+        self._menu_items_cache = None
+        self.save_config()
+        self.unload_plugin(plugin_id)
+
+    def get_plugin_menu_items(self) -> List[tuple]:
+        """全プラグインのメニュー項目をまとめて返す
+
+        構成が変わらない限りキャッシュを返す。
+        """
+        if self._menu_items_cache is not None:
+            return self._menu_items_cache
+        items = []
+        for plugin in tuple(self.loaded_plugins.values()):
+            cb = plugin.get_menu_items
+            try:
+                items.extend(cb())
+            except Exception as e:
+                print(f"メニュー取得失敗 {plugin.info.name}: {e}")
+        self._menu_items_cache = items
+        return items
+
+    def notify_log_loaded(self, logs):
+        # lower() 済みビューは全プラグインで1つを共有する。
+        # 通知中の load/unload で dict が変わっても安全なよう
+        # タプルに固めてから回す
+        lowered = LoweredLogs(logs)
+        for plugin in tuple(self.loaded_plugins.values()):
+            cb = plugin.on_log_loaded
+            try:
+                cb(logs, lowered=lowered)
+            except Exception as e:
+                print(f"プラグイン通知失敗 {plugin.info.name}: {e}")
+
+    def notify_log_filtered(self, logs):
+        for plugin in tuple(self.loaded_plugins.values()):
+            cb = plugin.on_log_filtered
+            try:
+                cb(logs)
+            except Exception as e:
+                print(f"プラグイン通知失敗 {plugin.info.name}: {e}")
+
+
+class PluginManagerDialog:
+    """プラグインの一覧・有効/無効を切り替えるダイアログ"""
+
+    def __init__(self, parent, plugin_manager: PluginManager):
+        # プラグイン検出時にこのモジュールごと import されるので、
+        # tkinter はダイアログを実際に開くここまで遅延させる
+        import tkinter as tk
+        from tkinter import ttk
+
+        self.plugin_manager = plugin_manager
+        self.dialog = tk.Toplevel(parent)
+        self.dialog.title("プラグイン管理")
+        self.dialog.geometry("600x400")
+
+        frame = ttk.Frame(self.dialog, padding=8)
+        frame.pack(fill=tk.BOTH, expand=True)
+
+        columns = ("name", "version", "enabled", "description")
+        self.plugin_tree = ttk.Treeview(
+            frame, columns=columns, show="headings", height=12)
+        self.plugin_tree.heading("name", text="名前")
+        self.plugin_tree.heading("version", text="バージョン")
+        self.plugin_tree.heading("enabled", text="状態")
+        self.plugin_tree.heading("description", text="説明")
+        self.plugin_tree.column("name", width=140)
+        self.plugin_tree.column("version", width=80)
+        self.plugin_tree.column("enabled", width=60)
+        self.plugin_tree.column("description", width=280)
+        self.plugin_tree.pack(fill=tk.BOTH, expand=True)
+
+        self.button_frame = ttk.Frame(frame)
+        self.button_frame.pack(fill=tk.X, pady=(8, 0))
+        ttk.Button(self.button_frame, text="有効化",
+                   command=self._enable_selected).pack(side=tk.LEFT)
+        ttk.Button(self.button_frame, text="無効化",
+                   command=self._disable_selected).pack(side=tk.LEFT, padx=4)
+        ttk.Button(self.button_frame, text="更新",
+                   command=self.refresh_plugin_list).pack(side=tk.LEFT)
+        ttk.Button(self.button_frame, text="閉じる",
+                   command=self.dialog.destroy).pack(side=tk.RIGHT)
+
+        self.refresh_plugin_list()
+
+    def refresh_plugin_list(self):
+        import tkinter as tk
+
+        tree = self.plugin_tree
+        children = tree.get_children()
+        if children:
+            # 1件ずつ delete せず1回の呼び出しで空にする
+            tree.delete(*children)
+        # 挿入中の行ごとの再描画を避けるため、いったん画面から外す
+        tree.pack_forget()
+        insert = tree.insert
+        states_get = self.plugin_manager.plugin_states.get
+        for plugin in self.plugin_manager.discover_plugins():
+            info = plugin.info
+            enabled = states_get(info.id, True)
+            insert(
+                "", tk.END, iid=info.id,
+                values=(info.name, info.version,
+                        "有効" if enabled else "無効", info.description))
+        tree.pack(fill=tk.BOTH, expand=True, before=self.button_frame)
+
+    def _selected_id(self) -> Optional[str]:
+        selection = self.plugin_tree.selection()
+        return selection[0] if selection else None
+
+    def _enable_selected(self):
+        from tkinter import messagebox
+
+        plugin_id = self._selected_id()
+        if plugin_id is None:
+            messagebox.showinfo("プラグイン管理", "プラグインを選択してください")
+            return
+        self.plugin_manager.enable_plugin(plugin_id)
+        self.refresh_plugin_list()
+
+    def _disable_selected(self):
+        from tkinter import messagebox
+
+        plugin_id = self._selected_id()
+        if plugin_id is None:
+            messagebox.showinfo("プラグイン管理", "プラグインを選択してください")
+            return
+        self.plugin_manager.disable_plugin(plugin_id)
+        self.refresh_plugin_list()
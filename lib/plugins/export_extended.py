@@ -0,0 +1,108 @@
+"""拡張エクスポートプラグイン(サンプル)"""
+
+import html
+from itertools import islice
+
+from constants import LOG_LEVEL_RE
+from plugin_manager import Plugin, PluginInfo
+
+# レベルごとの CSS クラス。LOG_LEVEL_RE の m.lastindex で引く
+_CLS = (
+    'log-line',
+    'log-line error',
+    'log-line warning',
+    'log-line info',
+    'log-line debug',
+)
+
+
+class ExportExtendedPlugin(Plugin):
+    """ログを HTML / Markdown 形式でエクスポートする"""
+
+    def __init__(self, app_context=None):
+        super().__init__(app_context)
+        self.info = PluginInfo(
+            id="export_extended",
+            name="拡張エクスポート",
+            version="1.0.0",
+            author="sample",
+            description="ログを HTML / Markdown で保存します",
+        )
+        self.current_logs = []
+
+    def on_log_loaded(self, logs, lowered=None):
+        self.current_logs = logs
+
+    def get_menu_items(self):
+        return [
+            ("HTML でエクスポート", self.export_html),
+            ("Markdown でエクスポート", self.export_markdown),
+        ]
+
+    def export_html(self):
+        # tkinter はメニューが実際に押されるまで import しない
+        from tkinter import filedialog, messagebox
+        if not self.current_logs:
+            messagebox.showinfo("エクスポート", "ログが読み込まれていません")
+            return
+        path = filedialog.asksaveasfilename(
+            defaultextension=".html",
+            filetypes=[("HTML", "*.html"), ("すべて", "*.*")])
+        if not path:
+            return
+        # 全文をメモリ上に組み立てず、バッファ付きでファイルへ直接書く
+        with open(path, 'w', encoding='utf-8', buffering=1 << 20) as f:
+            self._write_html(f)
+        messagebox.showinfo("エクスポート", f"保存しました: {path}")
+
+    def export_markdown(self):
+        from tkinter import filedialog, messagebox
+        if not self.current_logs:
+            messagebox.showinfo("エクスポート", "ログが読み込まれていません")
+            return
+        path = filedialog.asksaveasfilename(
+            defaultextension=".md",
+            filetypes=[("Markdown", "*.md"), ("すべて", "*.*")])
+        if not path:
+            return
+        with open(path, 'w', encoding='utf-8', buffering=1 << 20) as f:
+            self._write_markdown(f)
+        messagebox.showinfo("エクスポート", f"保存しました: {path}")
+
+    def _write_html(self, fp):
+        # 1MB バッファの fp へ行ごとに書く。write は Python 側で
+        # まとめられ、syscall はバッファ満杯時だけになる
+        write = fp.write
+        write(
+            "<!DOCTYPE html>\n<html>\n<head>\n"
+            "<meta charset='utf-8'>\n<title>VRChat Log</title>\n"
+            "<style>\n"
+            "body { background: #1e1e1e; color: #d4d4d4; "
+            "font-family: monospace; }\n"
+            ".log-line { white-space: pre-wrap; }\n"
+            ".error { color: #ff6b6b; }\n"
+            ".warning { color: #feca57; }\n"
+            ".info { color: #54a0ff; }\n"
+            ".debug { color: #95afc0; }\n"
+            "</style>\n</head>\n<body>\n"
+        )
+        search = LOG_LEVEL_RE.search
+        # スライスで新しいリストを作らず、先頭1000行だけ舐める
+        for log in islice(self.current_logs, 1000):
+            # 共有のレベル判定正規表現1回でクラス名を決める
+            m = search(log)
+            log_class = _CLS[m.lastindex if m is not None else 0]
+            write(f'<div class="{log_class}">'
+                  f'{html.escape(log.strip())}</div>\n')
+        write("</body>\n</html>\n")
+
+    def _write_markdown(self, fp):
+        write = fp.write
+        write("# VRChat Log\n\n```\n")
+        for log in islice(self.current_logs, 1000):
+            write(log.strip() + "\n")
+        write("```\n")
+
+
+def create_plugin(app_context=None):
+    return ExportExtendedPlugin(app_context)
@@ -0,0 +1,204 @@
+"""ログ統計プラグイン(サンプル)"""
+
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+from constants import LOG_LEVEL_RE
+from plugin_manager import Plugin, PluginInfo
+
+# 集計をUIスレッドから追い出すためのワーカー。必要になるまで作らない
+_executor = None
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="log_stats")
+    return _executor
+
+# 任意依存: pandas があれば集計を C レベルのベクトル走査に任せる
+try:
+    import pandas as _pd
+except ImportError:
+    _pd = None
+
+# 任意依存: numba があればバイト列走査を JIT コンパイルする
+try:
+    import numpy as _np
+    from numba import njit as _njit
+except ImportError:
+    _np = None
+    _njit = None
+
+if _njit is not None:
+
+    @_njit(cache=True, nogil=True)
+    def _find_folded(buf, start, end, pat):  # pragma: no cover
+        """ASCII を 0x20 で畳みながら pat を検索する"""
+        n = len(pat)
+        for i in range(start, end - n + 1):
+            hit = True
+            for j in range(n):
+                if buf[i + j] | 0x20 != pat[j]:
+                    hit = False
+                    break
+            if hit:
+                return True
+        return False
+
+    @_njit(cache=True, nogil=True)
+    def _count_levels_jit(buf, offs):  # pragma: no cover
+        """行オフセット配列に沿ってレベル別件数を数える"""
+        pat_error = _np.frombuffer(b'error', dtype=_np.uint8)
+        pat_exc = _np.frombuffer(b'exception', dtype=_np.uint8)
+        pat_warn = _np.frombuffer(b'warning', dtype=_np.uint8)
+        pat_info = _np.frombuffer(b'info', dtype=_np.uint8)
+        pat_debug = _np.frombuffer(b'debug', dtype=_np.uint8)
+        error = warning = info = debug = 0
+        for k in range(len(offs) - 1):
+            start = offs[k]
+            end = offs[k + 1]
+            if _find_folded(buf, start, end, pat_error) \
+                    or _find_folded(buf, start, end, pat_exc):
+                error += 1
+            elif _find_folded(buf, start, end, pat_warn):
+                warning += 1
+            elif _find_folded(buf, start, end, pat_info):
+                info += 1
+            elif _find_folded(buf, start, end, pat_debug):
+                debug += 1
+        return error, warning, info, debug
+
+
+class LogStatisticsPlugin(Plugin):
+    """読み込んだログのレベル別統計を表示する"""
+
+    def __init__(self, app_context=None):
+        super().__init__(app_context)
+        self.info = PluginInfo(
+            id="log_statistics",
+            name="ログ統計",
+            version="1.0.0",
+            author="sample",
+            description="ログレベルごとの件数を集計して表示します",
+        )
+        self.current_logs = []
+        self._series = None
+        self._buf = self._offs = None
+        self._stats_cache_key = None
+        self._stats_cache = None
+
+    def on_log_loaded(self, logs, lowered=None):
+        self.current_logs = logs
+        # pandas が使えるときだけ Series 化しておく(無ければ None)
+        self._series = _pd.Series(logs, dtype='object') if _pd else None
+        self._buf = self._offs = None
+        if _njit is not None and logs:
+            # 全行を1本のバッファに連結し、行オフセットを別配列に持つ
+            raw = '\n'.join(logs).encode('utf-8', 'replace')
+            self._buf = _np.frombuffer(raw, dtype=_np.uint8)
+            offs = [0]
+            pos = 0
+            for log in logs:
+                pos += len(log.encode('utf-8', 'replace')) + 1
+                offs.append(pos)
+            offs[-1] -= 1  # 最終行に改行は無い
+            self._offs = _np.array(offs, dtype=_np.int64)
+        # ログが入れ替わったので集計キャッシュを捨てる
+        self._stats_cache_key = None
+        self._stats_cache = None
+
+    def get_menu_items(self):
+        return [("ログ統計を表示", self.show_statistics)]
+
+    def show_statistics(self):
+        # tkinter はメニューが実際に押されるまで import しない
+        from tkinter import messagebox
+        if not self.current_logs:
+            messagebox.showinfo("ログ統計", "ログが読み込まれていません")
+            return
+        total = len(self.current_logs)
+        # 同じログに対する再表示は走査せずキャッシュを返す
+        key = (id(self.current_logs), total)
+        if key == self._stats_cache_key:
+            messagebox.showinfo("ログ統計", self._stats_cache)
+            return
+        root = getattr(self.app_context, 'root', None)
+        if root is None:
+            # root が無い環境(テスト等)では同期実行にフォールバック
+            self._show_result(key, total, self._count_levels())
+            return
+        # 走査はワーカースレッドで行い、UIは after で完了を待つ
+        future = _get_executor().submit(self._count_levels)
+        self._poll_stats(root, future, key, total)
+
+    def _poll_stats(self, root, future, key, total):
+        if not future.done():
+            root.after(50, self._poll_stats, root, future, key, total)
+            return
+        try:
+            counts = future.result()
+        except Exception as e:
+            print(f"ログ統計の集計に失敗: {e}")
+            return
+        self._show_result(key, total, counts)
+
+    def _show_result(self, key, total, counts):
+        from tkinter import messagebox
+        error_count, warning_count, info_count, debug_count = counts
+        text = (
+            f"総行数: {total:,}\n"
+            f"エラー: {error_count:,}\n"
+            f"警告: {warning_count:,}\n"
+            f"情報: {info_count:,}\n"
+            f"デバッグ: {debug_count:,}"
+        )
+        self._stats_cache_key = key
+        self._stats_cache = text
+        messagebox.showinfo("ログ統計", text)
+
+    def _count_levels(self):
+        """(エラー, 警告, 情報, デバッグ) の件数を返す"""
+        if self._buf is not None:
+            return _count_levels_jit(self._buf, self._offs)
+        if self._series is not None:
+            return self._count_levels_pandas()
+        # 共有のレベル判定正規表現1本で走査する。小文字コピーを
+        # 作らず、4回の substring 走査が1回のマッチになる。
+        # 最初のマッチ位置ではなくエラー優先で分類する
+        # (pandas / numba 経路と同じ優先順位)ため、行内の
+        # 全マッチからグループ番号の最小値を取る
+        finditer = LOG_LEVEL_RE.finditer
+        counts = Counter()
+        for line in self.current_logs:
+            best = 5
+            for m in finditer(line):
+                if m.lastindex < best:
+                    best = m.lastindex
+                    if best == 1:
+                        break
+            if best < 5:
+                counts[best] += 1
+        return counts[1], counts[2], counts[3], counts[4]
+
+    def _count_levels_pandas(self):
+        """pandas の C レベル正規表現走査で集計する
+
+        Python ループの elif 連鎖と同じ優先順位になるよう、
+        上位レベルに該当した行をマスクで除外していく。
+        """
+        s = self._series
+        contains = s.str.contains
+        is_error = contains('error|exception', case=False, regex=True)
+        is_warning = contains('warning', case=False) & ~is_error
+        seen = is_error | is_warning
+        is_info = contains('info', case=False) & ~seen
+        seen |= is_info
+        is_debug = contains('debug', case=False) & ~seen
+        return (int(is_error.sum()), int(is_warning.sum()),
+                int(is_info.sum()), int(is_debug.sum()))
+
+
+def create_plugin(app_context=None):
+    return LogStatisticsPlugin(app_context)
@@ -0,0 +1,102 @@
+"""読み込み進捗ダイアログ"""
+
+import tkinter as tk
+from tkinter import ttk
+from typing import Callable, Optional
+
+
+class ProgressDialog:
+    """ファイル読み込み中に表示する進捗ダイアログ"""
+
+    def __init__(self, parent, title: str = "読み込み中",
+                 on_cancel: Optional[Callable[[], None]] = None):
+        self.on_cancel = on_cancel
+        self.cancelled = False
+        # set_progress は最新値をここへ置くだけで、Tk への書き込みは
+        # 約30Hzの _flush がまとめて行う
+        self._pending: Optional[tuple] = None
+        self._flush_id: Optional[str] = None
+        self._last_msg: Optional[str] = None
+        self._last_pct: Optional[int] = None
+
+        self.dialog = tk.Toplevel(parent)
+        self.dialog.title(title)
+        self.dialog.resizable(False, False)
+        self.dialog.transient(parent)
+        self.dialog.grab_set()
+
+        # 画面中央に配置。withdraw してから1回の geometry で
+        # サイズと位置を決め、余計なレイアウトパスを発生させない
+        self.dialog.withdraw()
+        x = (self.dialog.winfo_screenwidth() - 400) // 2
+        y = (self.dialog.winfo_screenheight() - 150) // 2
+        self.dialog.geometry(f"400x150+{x}+{y}")
+        self.dialog.deiconify()
+
+        # pack は呼ぶたびに親のレイアウトを組み直すので、
+        # 4つのウィジェットは grid で一括配置する
+        main_frame = ttk.Frame(self.dialog, padding=16)
+        main_frame.pack(fill=tk.BOTH, expand=True)
+        main_frame.columnconfigure(0, weight=1)
+
+        self.message_label = ttk.Label(main_frame, text="準備中...")
+        self.message_label.grid(row=0, column=0, sticky=tk.W)
+
+        self.progress_var = tk.IntVar(value=0)
+        self.progress_bar = ttk.Progressbar(
+            main_frame, maximum=100, variable=self.progress_var)
+        self.progress_bar.grid(row=1, column=0, sticky=tk.EW, pady=8)
+
+        self.percent_label = ttk.Label(main_frame, text="0%")
+        self.percent_label.grid(row=2, column=0, sticky=tk.E)
+
+        self.cancel_button = ttk.Button(
+            main_frame, text="キャンセル", command=self._cancel)
+        self.cancel_button.grid(row=3, column=0, pady=(8, 0))
+
+        self.dialog.protocol("WM_DELETE_WINDOW", self._cancel)
+        self._flush_id = self.dialog.after(33, self._flush)
+
+    def set_progress(self, message: str, percentage: int):
+        """進捗表示を更新する
+
+        最新値を覚えるだけで Tk には触らない。実際の書き込みは
+        _flush が 33ms 周期で最後の値だけを反映するので、
+        呼び出し回数に関係なく Tk への書き込みは毎秒30回で頭打ち。
+        """
+        if self.cancelled:
+            return
+        self._pending = (message, percentage)
+
+    def _flush(self):
+        """after ループ本体。溜まっていた最新の進捗を反映する"""
+        if self.cancelled:
+            return
+        pending = self._pending
+        if pending is not None:
+            self._pending = None
+            message, percentage = pending
+            if message != self._last_msg:
+                self.message_label.config(text=message)
+                self._last_msg = message
+            if percentage != self._last_pct:
+                self.progress_var.set(percentage)
+                self.percent_label.config(text=f"{percentage}%")
+                self._last_pct = percentage
+        self._flush_id = self.dialog.after(33, self._flush)
+
+    def _cancel(self):
+        self.cancelled = True
+        if self.on_cancel:
+            self.on_cancel()
+        self.close()
+
+    def close(self):
+        try:
+            if self._flush_id is not None:
+                self.dialog.after_cancel(self._flush_id)
+                self._flush_id = None
+            self.dialog.grab_release()
+            self.dialog.destroy()
+        except tk.TclError:
+            pass
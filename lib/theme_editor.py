@@ -0,0 +1,140 @@
+"""テーマ編集ダイアログ"""
+
+import tkinter as tk
+from dataclasses import replace
+from tkinter import colorchooser, messagebox, simpledialog, ttk
+from typing import Callable, Optional
+
+from theme_manager import ColorScheme
+
+
+class ThemeEditor:
+    """テーマの色を1項目ずつ編集するダイアログ"""
+
+    # セクションごとの (属性名, 表示名) 表。UI はこの表から組み立てる
+    _COLOR_ROWS = (
+        ("背景・UI要素", (
+            ("background", "背景色"),
+            ("foreground", "文字色"),
+            ("select_bg", "選択背景色"),
+            ("select_fg", "選択文字色"),
+            ("tree_bg", "リスト背景色"),
+            ("tree_fg", "リスト文字色"),
+            ("entry_bg", "入力欄背景色"),
+            ("entry_fg", "入力欄文字色"),
+            ("button_bg", "ボタン背景色"),
+            ("button_fg", "ボタン文字色"),
+            ("text_area_bg", "テキスト欄背景色"),
+            ("text_area_fg", "テキスト欄文字色"),
+        )),
+        ("ログレベルの色", (
+            ("error_color", "エラー"),
+            ("warning_color", "警告"),
+            ("info_color", "情報"),
+            ("debug_color", "デバッグ"),
+            ("notification_color", "通知"),
+        )),
+    )
+
+    def __init__(self, parent, current_theme: ColorScheme,
+                 on_save: Optional[Callable[[ColorScheme], None]] = None):
+        self.parent = parent
+        self.on_save = on_save
+        self.original_theme = current_theme
+        # 全フィールドが str なので replace の浅いコピーで十分。
+        # asdict は deepcopy しながら再帰するので使わない
+        self.editing_theme = replace(current_theme)
+        self.color_buttons = {}
+
+        self.dialog = tk.Toplevel(parent)
+        self.dialog.title(f"テーマ編集 - {current_theme.name}")
+        self.dialog.transient(parent)
+
+        # withdraw してから1回の geometry でサイズと位置を決める
+        self.dialog.withdraw()
+        x = (self.dialog.winfo_screenwidth() - 480) // 2
+        y = (self.dialog.winfo_screenheight() - 560) // 2
+        self.dialog.geometry(f"480x560+{x}+{y}")
+        self.dialog.deiconify()
+
+        self.setup_ui()
+
+    def setup_ui(self):
+        canvas = tk.Canvas(self.dialog, highlightthickness=0)
+        scrollbar = ttk.Scrollbar(
+            self.dialog, orient=tk.VERTICAL, command=canvas.yview)
+        self.scroll_frame = ttk.Frame(canvas)
+        canvas.create_window((0, 0), window=self.scroll_frame, anchor=tk.NW)
+        canvas.configure(yscrollcommand=scrollbar.set)
+        canvas.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+
+        for section_text, rows in self._COLOR_ROWS:
+            section = ttk.LabelFrame(
+                self.scroll_frame, text=section_text, padding=8)
+            section.pack(fill=tk.X, padx=8, pady=4)
+            for attr_name, label_text in rows:
+                self._add_color_row(section, attr_name, label_text)
+
+        button_frame = ttk.Frame(self.scroll_frame)
+        button_frame.pack(fill=tk.X, padx=8, pady=8)
+        ttk.Button(button_frame, text="保存",
+                   command=self.save).pack(side=tk.LEFT)
+        ttk.Button(button_frame, text="リセット",
+                   command=self.reset).pack(side=tk.LEFT, padx=4)
+        ttk.Button(button_frame, text="閉じる",
+                   command=self.dialog.destroy).pack(side=tk.RIGHT)
+
+        # 行の内容は固定なので、スクロール範囲は全行を組み終えた後に
+        # 1回だけ計算する。<Configure> で毎回 bbox を
+        # 計算し直すと行追加のたびに全子ウィジェット走査が走る
+        self.dialog.update_idletasks()
+        canvas.configure(scrollregion=canvas.bbox("all"))
+
+    def _add_color_row(self, parent, attr_name: str, label_text: str):
+        row = ttk.Frame(parent)
+        row.pack(fill=tk.X, pady=2)
+        label = ttk.Label(row, text=label_text, width=16)
+        label.pack(side=tk.LEFT)
+        color = getattr(self.editing_theme, attr_name)
+        color_preview = tk.Label(row, text="　　", bg=color, relief=tk.SUNKEN)
+        color_preview.pack(side=tk.LEFT, padx=4)
+        # 行ごとのクロージャは作らず、属性名だけ束ねて共通ハンドラへ
+        button = ttk.Button(
+            row, text="変更...",
+            command=lambda a=attr_name, t=label_text:
+                self._on_color_button(a, t))
+        button.pack(side=tk.LEFT)
+        self.color_buttons[attr_name] = (color_preview, button)
+
+    def _on_color_button(self, attr_name: str, label_text: str):
+        """全色ボタン共通のハンドラ。現在値は dataclass から引く"""
+        new_color = colorchooser.askcolor(
+            color=getattr(self.editing_theme, attr_name),
+            title=f"{label_text}を選択")[1]
+        if new_color:
+            setattr(self.editing_theme, attr_name, new_color)
+            preview, _ = self.color_buttons[attr_name]
+            preview.config(bg=new_color)
+
+    def save(self):
+        name = simpledialog.askstring(
+            "テーマ保存", "テーマ名を入力してください",
+            initialvalue=self.editing_theme.name, parent=self.dialog)
+        if not name:
+            return
+        self.editing_theme.name = name
+        if self.on_save:
+            self.on_save(self.editing_theme)
+        messagebox.showinfo("テーマ保存", f"保存しました: {name}",
+                            parent=self.dialog)
+
+    def reset(self):
+        """編集内容を破棄して元テーマの色に戻す
+
+        ダイアログを作り直さず、編集中テーマとプレビューだけを
+        元の値に書き戻す。
+        """
+        self.editing_theme = replace(self.original_theme)
+        for attr_name, (preview, _) in self.color_buttons.items():
+            preview.config(bg=getattr(self.editing_theme, attr_name))
@@ -0,0 +1,245 @@
+"""カラーテーマの管理"""
+
+import json
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import MISSING, dataclass, fields, replace
+from pathlib import Path
+from typing import Dict, Optional
+
+# 任意依存: orjson があれば JSON の読み書きが数倍速い
+try:
+    import orjson
+
+    def _dumps(data) -> bytes:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2)
+
+    _loads = orjson.loads
+except ImportError:
+
+    def _dumps(data) -> bytes:
+        return json.dumps(data, ensure_ascii=False, indent=2).encode('utf-8')
+
+    _loads = json.loads
+
+
+@dataclass(slots=True)
+class ColorScheme:
+    """テーマ1つ分の配色"""
+    name: str
+    description: str = ""
+    author: str = ""
+    background: str = "#1e1e1e"
+    foreground: str = "#d4d4d4"
+    select_bg: str = "#264f78"
+    select_fg: str = "#ffffff"
+    tree_bg: str = "#252526"
+    tree_fg: str = "#cccccc"
+    entry_bg: str = "#3c3c3c"
+    entry_fg: str = "#d4d4d4"
+    button_bg: str = "#0e639c"
+    button_fg: str = "#ffffff"
+    text_area_bg: str = "#1e1e1e"
+    text_area_fg: str = "#d4d4d4"
+    error_color: str = "#ff6b6b"
+    warning_color: str = "#feca57"
+    info_color: str = "#54a0ff"
+    debug_color: str = "#95afc0"
+    notification_color: str = "#1dd1a1"
+
+    def to_dict(self) -> dict:
+        return _serialize_colorscheme(self)
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "ColorScheme":
+        # 古い設定ファイルに無いフィールドはフィールド定義の
+        # 既定値で補う。入力の data は書き換えない
+        return cls(**{**_FIELD_DEFAULTS, **data})
+
+
+# フィールド一覧と既定値表はクラス定義後に1回だけ作って使い回す
+_COLOR_FIELDS = fields(ColorScheme)
+_FIELD_NAMES = tuple(f.name for f in _COLOR_FIELDS)
+_FIELD_DEFAULTS = {
+    f.name: f.default for f in _COLOR_FIELDS if f.default is not MISSING
+}
+
+
+def _serialize_colorscheme(theme: "ColorScheme") -> dict:
+    """フィールド名タプルを舐めるだけの専用シリアライザ
+
+    呼び出しごとに dataclass のメタデータを歩き直さない。
+    テーマは編集で書き換わるので、結果自体はキャッシュしない。
+    """
+    return {name: getattr(theme, name) for name in _FIELD_NAMES}
+
+# 削除させない組み込みテーマ名
+_SYSTEM_THEMES = frozenset((
+    "ダークテーマ", "ライトテーマ", "ブルーテーマ",
+    "モノクローム", "ノルディック",
+))
+
+# 組み込みテーマ。import 時に1回だけ構築し、起動のたびに
+# 作り直したり書き出したりしない
+_DEFAULT_THEMES = (
+    ColorScheme(name="ダークテーマ",
+                description="標準のダークテーマ", author="system"),
+    ColorScheme(name="ライトテーマ",
+                description="明るい配色", author="system",
+                background="#f5f5f5", foreground="#333333",
+                tree_bg="#ffffff", tree_fg="#333333",
+                entry_bg="#ffffff", entry_fg="#333333",
+                text_area_bg="#ffffff", text_area_fg="#333333",
+                select_bg="#cce8ff", select_fg="#000000"),
+    ColorScheme(name="ブルーテーマ",
+                description="青基調", author="system",
+                background="#1b2838", tree_bg="#16202d",
+                select_bg="#2a475e"),
+    ColorScheme(name="モノクローム",
+                description="白黒基調", author="system",
+                background="#000000", foreground="#ffffff",
+                tree_bg="#111111", tree_fg="#eeeeee",
+                error_color="#ffffff", warning_color="#cccccc",
+                info_color="#aaaaaa", debug_color="#888888",
+                notification_color="#ffffff"),
+    ColorScheme(name="ノルディック",
+                description="Nord 風の配色", author="system",
+                background="#2e3440", foreground="#d8dee9",
+                tree_bg="#3b4252", tree_fg="#e5e9f0",
+                select_bg="#434c5e", error_color="#bf616a",
+                warning_color="#ebcb8b", info_color="#81a1c1",
+                debug_color="#4c566a",
+                notification_color="#a3be8c"),
+)
+
+
+class ThemeManager:
+    """テーマの読み込み・保存・切り替え"""
+
+    def __init__(self, themes_dir: Path):
+        # ここではパスを覚えるだけでディスクに触らない。
+        # フォルダ作成と読み込みは最初にテーマが要求されたときに行う
+        self.themes_dir = Path(themes_dir)
+        self.last_used_file = self.themes_dir / "last_used.json"
+        self._available_themes: Optional[Dict[str, ColorScheme]] = None
+        self._current_theme: Optional[ColorScheme] = None
+
+    def _ensure_loaded(self):
+        if self._available_themes is not None:
+            return
+        self._available_themes = {}
+        self.themes_dir.mkdir(parents=True, exist_ok=True)
+        self._create_default_themes()
+        self.load_themes()
+        self.load_last_used_theme()
+
+    @property
+    def available_themes(self) -> Dict[str, ColorScheme]:
+        self._ensure_loaded()
+        return self._available_themes
+
+    @available_themes.setter
+    def available_themes(self, value: Dict[str, ColorScheme]):
+        self._available_themes = value
+
+    @property
+    def current_theme(self) -> Optional[ColorScheme]:
+        self._ensure_loaded()
+        return self._current_theme
+
+    @current_theme.setter
+    def current_theme(self, value: Optional[ColorScheme]):
+        self._current_theme = value
+
+    def _create_default_themes(self):
+        """組み込みテーマのうちファイルが無いものだけ書き出す"""
+        for theme in _DEFAULT_THEMES:
+            theme_file = self.themes_dir / f"{theme.name}.json"
+            if not theme_file.exists():
+                self.save_theme(theme)
+
+    def load_themes(self):
+        """テーマフォルダの JSON をすべて読み込む
+
+        ファイルごとの読み込み+パースは IO バウンドなので
+        小さなスレッドプールで並列に行う。
+        """
+        self.available_themes = {}
+        theme_files = [
+            f for f in self.themes_dir.glob("*.json")
+            if f.name != "last_used.json"
+        ]
+        if not theme_files:
+            return
+        workers = min(len(theme_files), 4)
+        with ThreadPoolExecutor(max_workers=workers) as ex:
+            for theme in ex.map(self._load_theme_file, theme_files):
+                if theme is not None:
+                    self.available_themes[theme.name] = theme
+
+    @staticmethod
+    def _load_theme_file(theme_file: Path) -> Optional[ColorScheme]:
+        try:
+            data = _loads(theme_file.read_bytes())
+            return ColorScheme.from_dict(data)
+        except (OSError, ValueError, TypeError) as e:
+            print(f"テーマ読み込み失敗 {theme_file.name}: {e}")
+            return None
+
+    def save_theme(self, theme: ColorScheme):
+        theme_file = self.themes_dir / f"{theme.name}.json"
+        try:
+            theme_file.write_bytes(_dumps(theme.to_dict()))
+        except OSError as e:
+            print(f"テーマ保存失敗 {theme.name}: {e}")
+
+    def load_last_used_theme(self):
+        name = None
+        if self.last_used_file.exists():
+            try:
+                name = _loads(self.last_used_file.read_bytes()).get('name')
+            except (OSError, ValueError):
+                name = None
+        if name and name in self.available_themes:
+            self.current_theme = self.available_themes[name]
+        else:
+            self.current_theme = self.available_themes.get("ダークテーマ")
+
+    def save_last_used_theme(self):
+        if self.current_theme is None:
+            return
+        try:
+            self.last_used_file.write_bytes(
+                _dumps({'name': self.current_theme.name}))
+        except OSError as e:
+            print(f"テーマ設定の保存失敗: {e}")
+
+    def set_theme(self, name: str) -> Optional[ColorScheme]:
+        theme = self.available_themes.get(name)
+        if theme is not None:
+            self.current_theme = theme
+            self.save_last_used_theme()
+        return theme
+
+    def delete_theme(self, theme_name: str) -> bool:
+        if theme_name in _SYSTEM_THEMES:
+            return False
+        theme_file = self.themes_dir / f"{theme_name}.json"
+        if theme_file.exists():
+            theme_file.unlink()
+        self.available_themes.pop(theme_name, None)
+        return True
+
+    def create_custom_theme(self, base_theme: ColorScheme,
+                            new_name: str) -> ColorScheme:
+        """既存テーマを元にカスタムテーマを作る"""
+        # 色フィールドの列挙は dataclass 機構に任せる。
+        # フィールド追加時の写し忘れも起きない
+        custom_theme = replace(
+            base_theme,
+            name=new_name,
+            description=f"{base_theme.name}をベースにしたカスタムテーマ",
+            author="ユーザー",
+        )
+        self.available_themes[new_name] = custom_theme
+        self.save_theme(custom_theme)
+        return custom_theme
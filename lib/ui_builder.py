@@ -0,0 +1,134 @@
+"""メインウィンドウのUI組み立て"""
+
+import tkinter as tk
+from tkinter import ttk
+from typing import Callable, Dict
+
+from virtual_tree import VirtualizedLogTree
+
+# フィルタ対象のログレベル
+FILTER_LEVELS = ('error', 'warning', 'info', 'debug', 'notification')
+
+FILTER_LABELS = {
+    'error': 'エラー',
+    'warning': '警告',
+    'info': '情報',
+    'debug': 'デバッグ',
+    'notification': '通知',
+}
+
+
+class UIBuilder:
+    """メインウィンドウの各部品を組み立てる"""
+
+    @staticmethod
+    def setup_menubar(root, callbacks: Dict[str, Callable]):
+        """メニューバーを構築する"""
+        menubar = tk.Menu(root)
+        cb = callbacks.get
+
+        file_menu = tk.Menu(menubar, tearoff=0)
+        file_menu.add_command(label="開く...", accelerator="Ctrl+O",
+                              command=cb('open_file'))
+        file_menu.add_command(label="最新のログを開く", accelerator="F5",
+                              command=cb('open_latest'))
+        file_menu.add_separator()
+        export_menu = tk.Menu(file_menu, tearoff=0)
+        export_menu.add_command(label="テキスト形式...",
+                                command=cb('export_text'))
+        export_menu.add_command(label="JSON形式...",
+                                command=cb('export_json'))
+        file_menu.add_cascade(label="通知のエクスポート", menu=export_menu)
+        file_menu.add_separator()
+        file_menu.add_command(label="終了", accelerator="Ctrl+Q",
+                              command=cb('quit'))
+        menubar.add_cascade(label="ファイル", menu=file_menu)
+
+        view_menu = tk.Menu(menubar, tearoff=0)
+        view_menu.add_command(label="テーマ切り替え...",
+                              command=cb('change_theme'))
+        view_menu.add_command(label="テーマ編集...",
+                              command=cb('edit_theme'))
+        menubar.add_cascade(label="表示", menu=view_menu)
+
+        plugin_menu = tk.Menu(menubar, tearoff=0)
+        plugin_menu.add_command(label="プラグイン管理...",
+                                command=cb('manage_plugins'))
+        plugin_menu.add_separator()
+        get_items = cb('get_plugin_menu_items')
+        if get_items:
+            # 起動時には流し込まず、メニューを開いた瞬間に埋める。
+            # マネージャ側が同じリストを返す限り(キャッシュヒット)
+            # メニューの組み直しもしない
+            last_items = [None]
+
+            def populate_plugin_menu():
+                items = get_items()
+                if items is last_items[0]:
+                    return
+                last_items[0] = items
+                plugin_menu.delete(2, tk.END)
+                for label, command in items:
+                    plugin_menu.add_command(label=label, command=command)
+
+            plugin_menu.configure(postcommand=populate_plugin_menu)
+        menubar.add_cascade(label="プラグイン", menu=plugin_menu)
+
+        root.config(menu=menubar)
+        return menubar, plugin_menu
+
+    @staticmethod
+    def setup_filter_frame(parent, callbacks: Dict[str, Callable]):
+        """ログレベルのフィルタ用チェックボックス列を作る"""
+        frame = ttk.Frame(parent)
+        frame.pack(fill=tk.X, padx=4, pady=2)
+
+        ttk.Label(frame, text="フィルタ:").pack(side=tk.LEFT)
+        filter_vars: Dict[str, tk.BooleanVar] = {
+            level: tk.BooleanVar(value=True) for level in FILTER_LEVELS}
+        on_change = callbacks.get('on_filter_changed')
+        for level, var in filter_vars.items():
+            check = ttk.Checkbutton(
+                frame, text=FILTER_LABELS[level], variable=var,
+                command=on_change)
+            check.pack(side=tk.LEFT, padx=2)
+        return frame, filter_vars
+
+    @staticmethod
+    def setup_log_tree(parent) -> VirtualizedLogTree:
+        """ログ表示用の仮想化ツリーを作る"""
+        log_tree = VirtualizedLogTree(parent)
+        log_tree.frame.pack(fill=tk.BOTH, expand=True)
+        return log_tree
+
+    @staticmethod
+    def setup_message_panel(parent, callbacks: Dict[str, Callable]):
+        """通知グループの一覧と本文表示のパネルを作る"""
+        panel = ttk.Frame(parent)
+
+        columns = ("group", "count")
+        msg_tree = ttk.Treeview(
+            panel, columns=columns, show="headings", height=8)
+        # 見出しと列幅の設定は1本の Tcl スクリプトで一括適用する
+        widget = str(msg_tree)
+        msg_tree.tk.eval(
+            f"{widget} heading group -text {{グループ}}\n"
+            f"{widget} heading count -text {{件数}}\n"
+            f"{widget} column group -width 220\n"
+            f"{widget} column count -width 60 -stretch 0")
+        msg_tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+
+        msg_scroll = ttk.Scrollbar(
+            panel, orient=tk.VERTICAL, command=msg_tree.yview)
+        msg_tree.configure(yscrollcommand=msg_scroll.set)
+        msg_scroll.pack(side=tk.LEFT, fill=tk.Y)
+
+        message_text = tk.Text(panel, wrap=tk.WORD, width=48, height=8,
+                               state=tk.DISABLED)
+        message_text.pack(side=tk.LEFT, fill=tk.BOTH, expand=True,
+                          padx=(4, 0))
+
+        on_select = callbacks.get('on_group_selected')
+        if on_select:
+            msg_tree.bind("<<TreeviewSelect>>", on_select)
+        return panel, msg_tree, message_text
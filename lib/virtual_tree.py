@@ -0,0 +1,328 @@
+"""大量のログ行を仮想化して表示する Treeview"""
+
+import time
+import tkinter as tk
+from collections import OrderedDict
+from tkinter import ttk
+from typing import Dict, List, Optional, Tuple
+
+from constants import LOG_COLORS
+from utils import LogEntry
+
+# スペーサ行(範囲外の行数表示)の文字色
+_SPACER_COLOR = '#666666'
+
+# 行に付けてよいタグの全集合。__init__ で一括登録しておき、
+# 描画中に Tk へ新しいタグを作らせない。LogEntry.tags は
+# この集合のタグだけを使うこと
+KNOWN_TAGS = frozenset(LOG_COLORS) | {'spacer'}
+
+
+class VirtualizedLogTree:
+    """全行を挿入せず、見えている範囲だけ Treeview に入れる"""
+
+    def __init__(self, parent):
+        self.frame = ttk.Frame(parent)
+
+        self.all_logs: List[LogEntry] = []
+        self.total_items = 0
+        self.visible_range = (0, 0)
+        self.viewport_lines = 50
+        self.buffer_lines = 25
+        # 挿入に渡す値は set_logs 時に列ごとの並行リストへ
+        # 展開しておく(描画ループでの属性参照をなくす)
+        self._values: List[Tuple[str, str, str]] = []
+        self._tags: List[List[str]] = []
+        self._iids: List[str] = []
+        self._iid_to_index: Dict[str, int] = {}
+        # いま Treeview に入っているログ行 (iid -> インデックス)
+        self._rendered: Dict[str, int] = {}
+        # 直前に描画したときのスクロール先頭行。None なら必ず描画する
+        self._anchor_start: Optional[int] = None
+        # 範囲から出た行は即 delete せず detach して取り置く
+        # (iid -> インデックス、古い順)。戻りスクロールで move で
+        # 再接続でき、値の再マーシャリングが要らない
+        self._detached_lru: "OrderedDict[str, int]" = OrderedDict()
+        # スクロール通知の合流用 (after_idle の予約IDと最新位置)
+        self._pending_scroll = None
+        self._last_scroll_pos = 0.0
+        # 行の高さは 20px 決め打ちにせず、描画後に bbox で実測する
+        self._row_h = 20
+        self._resize_after = None
+        # 高速ドラッグ中の本描画を抑えるクールダウン
+        self._last_render_ts = 0.0
+        self._last_range_pos = 0.0
+        self._final_render_after = None
+
+        columns = ("time", "level", "content")
+        self.tree = ttk.Treeview(
+            self.frame, columns=columns, show="headings")
+
+        # 見出し・列幅・タグ設定は1本の Tcl スクリプトにまとめて評価し、
+        # 設定項目ぶんの Python→Tcl 往復を1回に抑える
+        widget = str(self.tree)
+        self.tree.tk.eval(
+            f"{widget} heading time -text {{時刻}}\n"
+            f"{widget} heading level -text {{レベル}}\n"
+            f"{widget} heading content -text {{内容}}\n"
+            f"{widget} column time -width 150 -stretch 0\n"
+            f"{widget} column level -width 90 -stretch 0\n"
+            f"{widget} column content -width 600\n"
+            + "\n".join(
+                f"{widget} tag configure {tag} -foreground {color}"
+                for tag, color in LOG_COLORS.items())
+            + f"\n{widget} tag configure spacer"
+            f" -foreground {_SPACER_COLOR}")
+
+        # スペーサ行はここで一度だけ作り、以後は値の差し替えと
+        # detach/move での付け外しだけにする
+        self.tree.insert("", tk.END, iid="spacer_top",
+                         values=("", "", ""), tags=["spacer"])
+        self.tree.insert("", tk.END, iid="spacer_bottom",
+                         values=("", "", ""), tags=["spacer"])
+        self.tree.detach("spacer_top", "spacer_bottom")
+
+        self.scrollbar_y = ttk.Scrollbar(
+            self.frame, orient=tk.VERTICAL, command=self._on_scroll)
+        self.tree.configure(yscrollcommand=self._on_scrollbar_set)
+
+        self.tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        self.scrollbar_y.pack(side=tk.RIGHT, fill=tk.Y)
+
+        self.tree.bind("<Configure>", self._on_resize)
+
+    def set_logs(self, logs: List[LogEntry]):
+        """表示対象のログ全体を差し替える"""
+        self.all_logs = logs
+        self.total_items = len(logs)
+        # 描画のたびに LogEntry の属性を4つ引かずに済むよう、
+        # insert に渡す形へここで一度だけ展開しておく
+        self._values = [(log.timestamp, log.level, log.content)
+                        for log in logs]
+        self._tags = [log.tags for log in logs]
+        # iid の文字列整形も描画のたびにやらず、ここで作り切る
+        self._iids = [f"log_{i}" for i in range(len(logs))]
+        self._iid_to_index = {iid: i
+                              for i, iid in enumerate(self._iids)}
+        # 前のログの行が残ると古い値のまま表示されるのでここで全消し
+        if self._rendered:
+            self.tree.delete(*self._rendered)
+            self._rendered.clear()
+        if self._detached_lru:
+            self.tree.delete(*self._detached_lru)
+            self._detached_lru.clear()
+        self.visible_range = (0, 0)
+        self._anchor_start = None
+        self._update_visible_range(0.0)
+
+    def _update_visible_range(self, scroll_position: float):
+        """スクロール位置から表示すべき範囲を計算し直す"""
+        if self.total_items == 0:
+            # スペーサは使い回すので消さずに外すだけ
+            self.tree.detach("spacer_top", "spacer_bottom")
+            # 何が付いているかは _rendered の台帳で分かっているので、
+            # get_children で Tcl から問い合わせ直さない
+            if self._rendered:
+                self.tree.delete(*self._rendered)
+                self._rendered.clear()
+            if self._detached_lru:
+                self.tree.delete(*self._detached_lru)
+                self._detached_lru.clear()
+            return
+        max_start = max(0, self.total_items - self.viewport_lines)
+        start = int(scroll_position * max_start)
+        self._last_range_pos = scroll_position
+        if self._anchor_start is not None and self._rendered:
+            delta = abs(start - self._anchor_start)
+            # 前回のアンカーからバッファ半分未満の移動なら、表示行は
+            # まだ全部付いているので描き直さない。再描画の頻度が
+            # 「スクロールした行数」から「バッファ半分ごとに1回」に落ちる
+            if delta < self.buffer_lines // 2:
+                return
+            # 直前の本描画から 200ms 以内に viewport 2個分を超えて
+            # 飛んでいる=高速ドラッグ中。スペーサの行数表示だけ
+            # 追従させ、本描画は止まってから1回で済ませる
+            if delta > 2 * self.viewport_lines \
+                    and time.monotonic() - self._last_render_ts < 0.2:
+                self._preview_spacers(start)
+                if self._final_render_after is not None:
+                    self.tree.after_cancel(self._final_render_after)
+                self._final_render_after = self.tree.after(
+                    200, self._final_render)
+                return
+        self._anchor_start = start
+        end = min(self.total_items,
+                  start + self.viewport_lines + self.buffer_lines)
+        start = max(0, start - self.buffer_lines)
+        if (start, end) != self.visible_range:
+            self.visible_range = (start, end)
+            self._render_visible_items()
+
+    def _render_visible_items(self):
+        """表示範囲との差分だけ Treeview に反映する
+
+        全消去して入れ直すと1行ずれただけのスクロールでも
+        viewport 行ぶんの delete/insert が走る。範囲から出た行だけ
+        まとめて消し、新しく入った行だけ端に挿す。
+        """
+        start, end = self.visible_range
+        rendered = self._rendered
+        detached = self._detached_lru
+
+        to_detach = [iid for iid, idx in rendered.items()
+                     if not start <= idx < end]
+        if to_detach:
+            self.tree.detach(*to_detach)
+            for iid in to_detach:
+                detached[iid] = rendered.pop(iid)
+        # 取り置きは viewport の4倍まで。あふれた古い行だけ本当に消す
+        cap = 4 * self.viewport_lines
+        while len(detached) > cap:
+            evicted, _ = detached.popitem(last=False)
+            self.tree.delete(evicted)
+
+        if rendered:
+            old_start = min(rendered.values())
+            old_end = max(rendered.values()) + 1
+        else:
+            old_start = old_end = start
+        insert = self.tree.insert
+        move = self.tree.move
+        values = self._values
+        tags = self._tags
+        iids = self._iids
+        # 上に広がった分は先頭へ降順で挿すと昇順に並ぶ。
+        # 取り置きにある行は insert し直さず move で付け直すだけ
+        for i in range(min(old_start, end) - 1, start - 1, -1):
+            iid = iids[i]
+            if iid in detached:
+                del detached[iid]
+                move(iid, "", 0)
+            else:
+                insert("", 0, iid=iid, values=values[i], tags=tags[i])
+            rendered[iid] = i
+        for i in range(max(old_end, start), end):
+            iid = iids[i]
+            if iid in detached:
+                del detached[iid]
+                move(iid, "", tk.END)
+            else:
+                insert("", tk.END, iid=iid,
+                       values=values[i], tags=tags[i])
+            rendered[iid] = i
+        self._update_spacers(start, end)
+        self._last_render_ts = time.monotonic()
+
+    def _preview_spacers(self, start: int):
+        """高速ドラッグ中、行はそのままに位置表示だけ追従させる"""
+        self.tree.item("spacer_top", values=("", "", f"↑ {start:,} 行"))
+        rest = max(0, self.total_items - start - self.viewport_lines)
+        self.tree.item("spacer_bottom", values=("", "", f"↓ {rest:,} 行"))
+
+    def _final_render(self):
+        """ドラッグが落ち着いたあとの本描画(クールダウン無視)"""
+        self._final_render_after = None
+        self._last_render_ts = 0.0
+        try:
+            self._update_visible_range(self._last_range_pos)
+        except tk.TclError:
+            pass
+
+    def _update_spacers(self, start: int, end: int):
+        """範囲外の行数を示すスペーサ行を上下端に合わせる
+
+        __init__ で作った2行を使い回し、値の差し替えと
+        detach/move の付け外しだけで済ませる。
+        """
+        tree = self.tree
+        if start > 0:
+            tree.item("spacer_top", values=("", "", f"↑ {start:,} 行"))
+            tree.move("spacer_top", "", 0)
+        else:
+            tree.detach("spacer_top")
+        if end < self.total_items:
+            tree.item("spacer_bottom",
+                      values=("", "", f"↓ {self.total_items - end:,} 行"))
+            tree.move("spacer_bottom", "", tk.END)
+        else:
+            tree.detach("spacer_bottom")
+
+    def _on_scroll(self, *args):
+        """スクロールバー操作
+
+        yview が位置を動かすと yscrollcommand 経由で
+        _on_scrollbar_set に新しい位置が同期的に届くので、
+        こちらで追加の再描画を予約する必要はない。
+        """
+        self.tree.yview(*args)
+
+    def _on_scrollbar_set(self, first, last):
+        """Treeview 側からのスクロール位置通知
+
+        ドラッグ中は1ピクセル動くたびに飛んでくるので、位置だけ
+        控えて再描画は after_idle で1アイドルサイクル1回にまとめる。
+        """
+        f = float(first)
+        # 自分の yview 起因の折り返し通知など、1行未満しか
+        # 動いていないものはスクロールバーに転送するだけで済ませる
+        if abs(f - self._last_scroll_pos) \
+                < 1.0 / max(1, self.total_items):
+            self.scrollbar_y.set(first, last)
+            return
+        self._last_scroll_pos = f
+        if self._pending_scroll is None:
+            self._pending_scroll = self.tree.after_idle(
+                self._flush_scroll)
+        self.scrollbar_y.set(first, last)
+
+    def _flush_scroll(self):
+        """合流したスクロール位置で1回だけ再描画する"""
+        self._pending_scroll = None
+        try:
+            self._update_visible_range(self._last_scroll_pos)
+        except tk.TclError:
+            pass
+
+    def _on_resize(self, event):
+        """サイズ変更。ドラッグ中は Configure が連打されるので
+        100ms 静まってから1回だけ再計算する"""
+        if self._resize_after is not None:
+            self.tree.after_cancel(self._resize_after)
+        self._resize_after = self.tree.after(
+            100, lambda h=event.height: self._do_resize(h))
+
+    def _do_resize(self, height: int):
+        self._resize_after = None
+        self._probe_row_height()
+        self.viewport_lines = max(10, height // self._row_h)
+        # viewport が変わったので中間点スキップを1回無効にする
+        self._anchor_start = None
+        try:
+            first = self.tree.yview()[0]
+        except tk.TclError:
+            first = 0.0
+        self._update_visible_range(first)
+
+    def _probe_row_height(self):
+        """表示中の行から実際の行高を測り直す
+
+        フォントや DPI 設定で 20px とは限らないため、
+        決め打ちではなく bbox の実測値を使う。
+        """
+        rendered = self._rendered
+        if not rendered:
+            return
+        bbox = self.tree.bbox(next(iter(rendered)))
+        if bbox and bbox[3] > 0:
+            self._row_h = bbox[3]
+
+    def get_log_by_iid(self, iid: str) -> Optional[LogEntry]:
+        """Treeview の iid から元のログを取り出す
+
+        iid を split して数値に戻す代わりに、set_logs で作った
+        逆引き表を1回引くだけ。
+        """
+        index = self._iid_to_index.get(iid)
+        if index is None:
+            return None
+        return self.all_logs[index]
@@ -0,0 +1,11 @@
+"""VRChat Log Viewer 起動スクリプト"""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent / "lib"))
+
+from main_window import main  # noqa: E402
+
+if __name__ == "__main__":
+    main()